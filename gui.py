@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import functools
+import math
 import sys
+import threading
+import time
 from pathlib import Path
-import datetime as dt
 
-from PySide6.QtCore import Qt, QUrl, QThread, Signal, QObject
+from PySide6.QtCore import Qt, QUrl, QThread, QTimer, Signal, QObject
 from PySide6.QtGui import QFont, QColor, QPalette, QDesktopServices
 from PySide6.QtWidgets import (
     QApplication,
@@ -26,27 +29,91 @@ from PySide6.QtWidgets import (
 
 from lsm6200.config import load_config
 from lsm6200.simulator import MicrometerSimulator
-from lsm6200.processing import process_value, classify_six_bins
+from lsm6200.processing import (
+    ProcessedValue,
+    categories_relative,
+    compute_bin_edges,
+    make_classifier,
+    process_value,
+    process_values,
+)
 from lsm6200.logging_utils import CsvLogger
-from lsm6200.serial_utils import available_ports, managed_serial
+from lsm6200.serial_utils import available_ports, iter_lines, managed_serial
 from lsm6200.protocols import Mitutoyo6200Parser
-from lsm6200.classifier import classify_value
+from lsm6200.classifier import VERDICTS, classification_reason, classify_verdict
+
+
+PORTS_CACHE_TTL = 2.0  # seconds; port enumeration can take hundreds of ms on Windows
+LIVE_BATCH_SIZE = 32
+LIVE_BATCH_INTERVAL = 0.05  # seconds; caps GUI updates at ~20 Hz on fast streams
+SIM_BATCH_SIZE = 100  # readings per "RUN ×N" click
+IDLE_COLOR = "#444444"
+VERDICT_COLORS = {"PASS": "#2e7d32", "FAIL": "#c62828"}
+OTHER_VERDICT_COLOR = "#f9a825"
+MAX_STANDARD_MM = 1000.0  # beyond this the 0.001 mm bands are below float resolution anyway
+STANDARD_INPUT_ERROR = f"請輸入 0 到 {MAX_STANDARD_MM:g} mm 之間的有效數值，如 0.110"
+
+_ENSURED_DIRS: set[Path] = set()
+
+
+def _ensure_dir(d: Path) -> None:
+    """mkdir -p once per directory path for the lifetime of the app."""
+    if d not in _ENSURED_DIRS:
+        d.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(d)
+
+
+def _parse_standard(text: str) -> float | None:
+    """Standard size typed in the setup dialog, or None if it is not a usable size."""
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    if not math.isfinite(value) or not 0.0 < value <= MAX_STANDARD_MM:
+        return None
+    return value
+
+
+@functools.lru_cache(maxsize=32)
+def _rules_text(standard: float) -> str:
+    b = compute_bin_edges(standard)
+    return (
+        "分類規則（基於標準尺寸）\n"
+        f"1 超過上限公差: v ≥ {b.hi_limit:.3f}\n"
+        f"2 標準+0.005: {b.bin2[0]:.3f} ≤ v ≤ {b.bin2[1]:.3f}\n"
+        f"3 標準±0.002: {b.bin3[0]:.3f} ≤ v ≤ {b.bin3[1]:.3f}\n"
+        f"4 標準-0.005: {b.bin4[0]:.3f} ≤ v ≤ {b.bin4[1]:.3f}\n"
+        f"5 標準-0.010: {b.bin5[0]:.3f} ≤ v ≤ {b.bin5[1]:.3f}\n"
+        f"6 超過下限公差: v ≤ {b.lo_limit:.3f}"
+    )
 
 
 class SerialWorker(QObject):
-    measurement = Signal(float, str, str, str, str)  # value, unit, verdict, reason, raw
+    batch = Signal(list)  # list of (value, unit, verdict code, reason, raw); see classifier.VERDICTS
     status = Signal(str)
     error = Signal(str)
     finished = Signal()
 
-    def __init__(self, cfg):
+    def __init__(self, cfg, csv_logger: CsvLogger | None, csv_lock: threading.Lock):
         super().__init__()
         self.cfg = cfg
+        # Shared with MainWindow, which owns it and may swap it (new session) under csv_lock
+        self.csv_logger = csv_logger
+        self._csv_lock = csv_lock
         self._running = False
+        self._batch: list[tuple] = []
+        self._last_flush = time.monotonic()
+
+    def _emit_batch(self):
+        if self._batch:
+            self.batch.emit(self._batch)
+            self._batch = []
+        self._last_flush = time.monotonic()
 
     def start(self):
         self._running = True
-        parser = Mitutoyo6200Parser(expected_unit=self.cfg.classification.units)
+        cls_cfg = self.cfg.classification
+        parser = Mitutoyo6200Parser(expected_unit=cls_cfg.units)
         try:
             with managed_serial(
                 port=self.cfg.serial.port,
@@ -55,21 +122,40 @@ class SerialWorker(QObject):
                 parity=self.cfg.serial.parity,
                 stopbits=self.cfg.serial.stopbits,
                 timeout=self.cfg.serial.timeout,
-            ) as ser, CsvLogger(self.cfg.logging) as csvlog:
+            ) as ser:
                 self.status.emit("connected")
-                while self._running:
-                    line = ser.readline()
+                csv_lock = self._csv_lock
+                for line in iter_lines(ser, lambda: self._running):
                     if not line:
+                        # Idle read timeout: push out any rows still in the write buffer
+                        with csv_lock:
+                            if self.csv_logger is not None:
+                                self.csv_logger.flush()
+                        self._emit_batch()
                         continue
                     meas = parser.parse_line(line)
                     if not meas:
                         continue
-                    res = classify_value(meas.value, self.cfg.classification)
-                    csvlog.log(meas.value, meas.unit, res.verdict, res.reason or "", meas.raw)
-                    self.measurement.emit(meas.value, meas.unit or "", res.verdict, res.reason or "", meas.raw)
+                    code = classify_verdict(meas.value, cls_cfg)
+                    reason = classification_reason(meas.value, cls_cfg) or ""
+                    verdict = VERDICTS[code]
+                    with csv_lock:
+                        # None once the window has closed the logger on exit
+                        if self.csv_logger is not None:
+                            self.csv_logger.log(meas.value, meas.unit, verdict, reason, meas.raw)
+                    self._batch.append((meas.value, meas.unit or "", code, reason, meas.raw))
+                    if len(self._batch) >= LIVE_BATCH_SIZE or time.monotonic() - self._last_flush >= LIVE_BATCH_INTERVAL:
+                        self._emit_batch()
         except Exception as e:
             self.error.emit(str(e))
         finally:
+            try:
+                with self._csv_lock:
+                    if self.csv_logger is not None:
+                        self.csv_logger.flush()
+            except Exception:
+                pass
+            self._emit_batch()
             self.status.emit("disconnected")
             self.finished.emit()
 
@@ -84,14 +170,25 @@ class MainWindow(QWidget):
         self.cfg = load_config()
         self.sim = MicrometerSimulator()
         self.csv_logger = None  # type: ignore
+        # The GUI thread and the live worker write through the same logger, one at a time
+        self._csv_lock = threading.Lock()
         self.standard = 0.110  # default standard before user setup
+        self._classify = make_classifier(self.standard)
         self.session_started = False
         self.thread: QThread | None = None
         self.worker: SerialWorker | None = None
         self.live_connected = False
+        self._last_ports: tuple[str, ...] | None = None
+        self._report_url_cache: dict[Path, QUrl] = {}
+        self._palette_cache: dict[str, QPalette] = {}
+        self._live_unit: str | None = None
+        self._live_unit_suffix = " mm"
 
         self._build_ui()
-        self._update_category_style("#444444")
+        # Build one palette per known category/verdict color up front
+        for color_hex in (IDLE_COLOR, OTHER_VERDICT_COLOR, *VERDICT_COLORS.values(), *(c.color for c in categories_relative())):
+            self._category_palette(color_hex)
+        self._update_category_style(IDLE_COLOR)
         # Default to Live tab but without connecting; user can switch to Sim
         self._refresh_ports()
 
@@ -164,10 +261,14 @@ class MainWindow(QWidget):
         self.chk_log = QCheckBox("紀錄至 CSV")
         self.chk_log.setChecked(True)
         self.btn_run.setEnabled(False)  # enable after setup confirmed
+        self.btn_run_batch = QPushButton(f"RUN ×{SIM_BATCH_SIZE}")
+        self.btn_run_batch.clicked.connect(lambda: self.run_batch(SIM_BATCH_SIZE))
+        self.btn_run_batch.setEnabled(False)
         # View report button
         self.btn_view_report = QPushButton("查看量測報表")
         self.btn_view_report.clicked.connect(self.on_view_report)
         ctrl_layout.addWidget(self.btn_run)
+        ctrl_layout.addWidget(self.btn_run_batch)
         ctrl_layout.addWidget(self.chk_log)
         ctrl_layout.addWidget(self.btn_view_report)
         ctrl_layout.addStretch(1)
@@ -181,18 +282,23 @@ class MainWindow(QWidget):
         self.tabs.addTab(sim_tab, "模擬模式")
 
         # Wire Live tab actions
-        self.btn_refresh_ports.clicked.connect(self._refresh_ports)
+        self.btn_refresh_ports.clicked.connect(self._rescan_ports)
         self.btn_connect.clicked.connect(self.on_connect)
         self.btn_disconnect.clicked.connect(self.on_disconnect)
         # Prompt sim measurement setup initially
         self._prompt_measurement_setup()
 
+    def _category_palette(self, color_hex: str) -> QPalette:
+        pal = self._palette_cache.get(color_hex)
+        if pal is None:
+            pal = QPalette(self.category_label.palette())
+            pal.setColor(QPalette.Window, QColor(color_hex))
+            pal.setColor(QPalette.WindowText, QColor("white"))
+            self._palette_cache[color_hex] = pal
+        return pal
+
     def _update_category_style(self, color_hex: str):
-        pal = self.category_label.palette()
-        pal.setColor(QPalette.Window, QColor(color_hex))
-        pal.setColor(QPalette.WindowText, QColor("white"))
-        self.category_label.setPalette(pal)
-        self.category_label.setAutoFillBackground(True)
+        self.category_label.setPalette(self._category_palette(color_hex))
 
     def _prompt_measurement_setup(self):
         dlg = QDialog(self)
@@ -214,47 +320,43 @@ class MainWindow(QWidget):
         btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         layout.addWidget(btns)
 
+        last_text = [None]
+
         def refresh_rules():
-            try:
-                val = float(input_size.text())
-            except ValueError:
-                rules_label.setText("請輸入有效數值，如 0.110")
+            entered = input_size.text()
+            if entered == last_text[0]:
                 return
-            s = val
-            hi_limit = s + 0.008
-            bin2_lo, bin2_hi = s + 0.003, s + 0.007
-            bin3_lo, bin3_hi = s - 0.002, s + 0.002
-            bin4_lo, bin4_hi = s - 0.007, s - 0.003
-            bin5_lo, bin5_hi = s - 0.012, s - 0.008
-            lo_limit = s - 0.013
-            text = (
-                "分類規則（基於標準尺寸）\n"
-                f"1 超過上限公差: v ≥ {hi_limit:.3f}\n"
-                f"2 標準+0.005: {bin2_lo:.3f} ≤ v ≤ {bin2_hi:.3f}\n"
-                f"3 標準±0.002: {bin3_lo:.3f} ≤ v ≤ {bin3_hi:.3f}\n"
-                f"4 標準-0.005: {bin4_lo:.3f} ≤ v ≤ {bin4_hi:.3f}\n"
-                f"5 標準-0.010: {bin5_lo:.3f} ≤ v ≤ {bin5_hi:.3f}\n"
-                f"6 超過下限公差: v ≤ {lo_limit:.3f}"
-            )
-            rules_label.setText(text)
-
-        input_size.textChanged.connect(lambda _: refresh_rules())
+            last_text[0] = entered
+            val = _parse_standard(entered)
+            if val is None:
+                rules_label.setText(STANDARD_INPUT_ERROR)
+                return
+            # Different texts often parse to the same float ("0.11", "0.110", " 0.11")
+            rules_label.setText(_rules_text(val))
+
+        # Coalesce keystrokes: rebuild the rules text once typing pauses
+        rules_timer = QTimer(dlg)
+        rules_timer.setSingleShot(True)
+        rules_timer.setInterval(150)
+        rules_timer.timeout.connect(refresh_rules)
+        input_size.textChanged.connect(lambda _: rules_timer.start())
         refresh_rules()
 
         btns.accepted.connect(dlg.accept)
         btns.rejected.connect(dlg.reject)
 
         if dlg.exec() == QDialog.Accepted:
-            try:
-                s = float(input_size.text())
-            except ValueError:
-                QMessageBox.warning(self, "輸入錯誤", "請輸入有效數值，如 0.110")
+            s = _parse_standard(input_size.text())
+            if s is None:
+                QMessageBox.warning(self, "輸入錯誤", STANDARD_INPUT_ERROR)
                 return self._prompt_measurement_setup()
             self.standard = float(f"{s:.3f}")
+            self._classify = make_classifier(self.standard)
             # apply standard to simulator and session CSV
             self.sim.cfg.standard = self.standard
             self._setup_session_csv()
             self.btn_run.setEnabled(True)
+            self.btn_run_batch.setEnabled(True)
             self.session_started = True
         else:
             # user canceled: keep RUN disabled
@@ -262,17 +364,40 @@ class MainWindow(QWidget):
 
     def _setup_session_csv(self):
         # New CSV file per session: size + date + start time
-        start = dt.datetime.now()
-        date_str = start.strftime("%Y%m%d")
-        time_str = start.strftime("%H%M%S")
+        start_str = time.strftime("%Y%m%d_%H%M%S", time.localtime())
         size_str = f"{self.standard:.3f}mm"
-        filename = f"{size_str}_{date_str}_{time_str}.csv"
+        filename = f"{size_str}_{start_str}.csv"
+        # CsvLogger creates the directory when it opens the file
         logs_dir = Path(self.cfg.logging.csv_path).parent if self.cfg.logging.csv_path else Path("logs")
-        logs_dir.mkdir(parents=True, exist_ok=True)
         self.cfg.logging.csv_path = str(logs_dir / filename)
         # Start a fresh file, then append subsequent runs in this session
         # CsvLogger will write header when file is empty even in append mode
         self.cfg.logging.append = True
+        # Keep one logger open for the whole session instead of reopening per RUN
+        self._open_session_csv()
+
+    def _open_session_csv(self):
+        """Open a logger on cfg.logging.csv_path, replacing the current one (also in the live worker)."""
+        with self._csv_lock:
+            self._close_csv_locked()
+            # Appending continues the "No." column from the file's last row
+            self.csv_logger = CsvLogger(self.cfg.logging).__enter__()
+            if self.worker is not None:
+                self.worker.csv_logger = self.csv_logger
+
+    def _close_session_csv(self):
+        with self._csv_lock:
+            self._close_csv_locked()
+
+    def _close_csv_locked(self):
+        if self.csv_logger is not None:
+            try:
+                self.csv_logger.__exit__(None, None, None)
+            except Exception:
+                pass
+            self.csv_logger = None
+            if self.worker is not None:
+                self.worker.csv_logger = None
 
     def on_run(self):
         if not self.session_started:
@@ -282,44 +407,76 @@ class MainWindow(QWidget):
         # Simulate a high-precision reading (5 dp)
         raw = self.sim.next_value()
         pv = process_value(raw)
-        cat_res = classify_six_bins(pv.rounded_3dp, standard=self.standard)
+        cat_res = self._classify(pv.rounded_3dp)
+
+        self._show_sim_result(pv, cat_res)
+
+        # Optional CSV log
+        if self.chk_log.isChecked() and self.csv_logger is not None:
+            try:
+                self._log_sim_result(pv.raw_5dp, pv.rounded_3dp, cat_res)
+            except Exception:
+                pass
 
-        # Update UI
+    def run_batch(self, n: int):
+        """Simulate n readings in one go (load testing); logs every row, shows the last."""
+        if not self.session_started or n <= 0:
+            return
+        batch = process_values(self.sim.next_values(n))
+        rows = []
+        cat_res = None
+        for raw_5dp, rounded_3dp in zip(batch.raw_5dp.tolist(), batch.rounded_3dp.tolist()):
+            cat_res = self._classify(rounded_3dp)
+            rows.append((rounded_3dp, cat_res.category.code, "mm", cat_res.reason, f"raw={raw_5dp:.5f}"))
+        if self.chk_log.isChecked() and self.csv_logger is not None:
+            with self._csv_lock:
+                self.csv_logger.log_categorized_many(rows)
+        last = ProcessedValue(
+            raw_5dp=float(batch.raw_5dp[-1]),
+            cut_4dp=float(batch.cut_4dp[-1]),
+            rounded_3dp=float(batch.rounded_3dp[-1]),
+        )
+        self._show_sim_result(last, cat_res)
+
+    def _show_sim_result(self, pv, cat_res):
         self.raw5.setText(f"{pv.raw_5dp:.5f} mm")
         self.cut4.setText(f"{pv.cut_4dp:.4f} mm")
         self.round3.setText(f"{pv.rounded_3dp:.3f} mm")
         self.category_label.setText(f"分類：{cat_res.category.code} - {cat_res.category.name}  ({cat_res.reason})")
         self._update_category_style(cat_res.category.color)
 
-        # Optional CSV log
-        if self.chk_log.isChecked():
-            from lsm6200.logging_utils import CsvLogger
-            try:
-                with CsvLogger(self.cfg.logging) as log:
-                    log.log_categorized(
-                        value_3dp=pv.rounded_3dp,
-                        category_code=cat_res.category.code,
-                        unit="mm",
-                        reason=cat_res.reason,
-                        raw=f"raw={pv.raw_5dp:.5f}",
-                    )
-            except Exception:
-                pass
+    def _log_sim_result(self, raw_5dp: float, rounded_3dp: float, cat_res):
+        with self._csv_lock:
+            self.csv_logger.log_categorized(
+                value_3dp=rounded_3dp,
+                category_code=cat_res.category.code,
+                unit="mm",
+                reason=cat_res.reason,
+                raw=f"raw={raw_5dp:.5f}",
+            )
 
     # Live mode helpers
+    def _rescan_ports(self):
+        # Explicit rescan (e.g. adapter just plugged in): skip the cached list
+        available_ports.invalidate()
+        self._refresh_ports()
+
     def _refresh_ports(self):
         try:
-            ports = available_ports()
+            ports = tuple(available_ports(ttl=PORTS_CACHE_TTL))
         except Exception:
-            ports = []
-        current = self.cfg.serial.port or ""
-        self.cmb_ports.clear()
-        for p in ports:
-            self.cmb_ports.addItem(p)
-        if current:
-            idx = self.cmb_ports.findText(current)
-            if idx >= 0:
-                self.cmb_ports.setCurrentIndex(idx)
+            ports = ()
+        # Only repopulate the combo when the port list actually changed
+        if ports != self._last_ports:
+            self._last_ports = ports
+            current = self.cfg.serial.port or ""
+            self.cmb_ports.clear()
+            for p in ports:
+                self.cmb_ports.addItem(p)
+            if current:
+                idx = self.cmb_ports.findText(current)
+                if idx >= 0:
+                    self.cmb_ports.setCurrentIndex(idx)
         self.live_status.setText("狀態：待連線" if ports else "狀態：未找到可用 COM")
 
     def on_connect(self):
@@ -330,12 +487,16 @@ class MainWindow(QWidget):
             QMessageBox.warning(self, "未選擇 COM", "請先選擇可用的 COM 埠")
             return
         self.cfg.serial.port = port
+        # Live rows go through the session logger so the "No." column has one owner;
+        # before any session setup, open one on the configured path
+        if self.csv_logger is None:
+            self._open_session_csv()
         # Start worker thread
         self.thread = QThread()
-        self.worker = SerialWorker(self.cfg)
+        self.worker = SerialWorker(self.cfg, self.csv_logger, self._csv_lock)
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.start)
-        self.worker.measurement.connect(self._on_live_measurement)
+        self.worker.batch.connect(self._on_live_batch)
         self.worker.status.connect(self._on_live_status)
         self.worker.error.connect(self._on_live_error)
         self.worker.finished.connect(self.thread.quit)
@@ -351,15 +512,25 @@ class MainWindow(QWidget):
             self.worker.stop()
         self.btn_disconnect.setEnabled(False)
 
-    def _on_live_measurement(self, value: float, unit: str, verdict: str, reason: str, raw: str):
+    def _on_live_batch(self, batch: list):
+        # Rows are already logged by the worker; only the latest sample is rendered
+        if batch:
+            self._on_live_measurement(*batch[-1])
+
+    def _on_live_measurement(self, value: float, unit: str, verdict_code: int, reason: str, raw: str):
+        verdict = VERDICTS[verdict_code]
         # Map verdict to color similar to CLI
-        color = "#2e7d32" if verdict == "PASS" else ("#c62828" if verdict == "FAIL" else "#f9a825")
+        color = VERDICT_COLORS.get(verdict, OTHER_VERDICT_COLOR)
+        # Unit assumes mm unless otherwise provided; rebuild the suffix only when it changes
+        if unit != self._live_unit:
+            self._live_unit = unit
+            self._live_unit_suffix = f" {unit or 'mm'}"
+        suffix = self._live_unit_suffix
         self.category_label.setText(f"分類：{verdict}  ({reason})")
         self._update_category_style(color)
-        # Update numeric labels (unit assumes mm unless otherwise provided)
-        self.raw5.setText(f"{value:.5f} {unit or 'mm'}")
-        self.cut4.setText(f"{value:.4f} {unit or 'mm'}")
-        self.round3.setText(f"{value:.3f} {unit or 'mm'}")
+        self.raw5.setText(f"{value:.5f}{suffix}")
+        self.cut4.setText(f"{value:.4f}{suffix}")
+        self.round3.setText(f"{value:.3f}{suffix}")
 
     def _on_live_status(self, s: str):
         if s == "connected":
@@ -379,6 +550,9 @@ class MainWindow(QWidget):
             self.thread.deleteLater()
             self.thread = None
         self.worker = None
+        # The logger opened just for live mode is not needed once disconnected
+        if not self.session_started:
+            self._close_session_csv()
 
     def on_view_report(self):
         """Open the current session CSV if available; otherwise open the logs directory.
@@ -388,23 +562,42 @@ class MainWindow(QWidget):
         except Exception:
             csv_path = ""
 
+        # Make buffered rows visible before handing the file to another app
+        if self.csv_logger is not None:
+            try:
+                with self._csv_lock:
+                    self.csv_logger.flush()
+            except Exception:
+                pass
+
         target = None
+        is_file = False
         if csv_path:
             p = Path(csv_path)
-            if p.exists():
-                target = p
-            else:
-                target = p.parent
+            is_file = p.exists()
+            target = p if is_file else p.parent
         else:
             target = Path("logs")
 
-        try:
-            target.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            pass
+        url = self._report_url_cache.get(target)
+        if url is None:
+            # Create (directories only) and resolve each report target once per session
+            if not is_file:
+                try:
+                    _ensure_dir(target)
+                except Exception:
+                    pass
+            url = QUrl.fromLocalFile(str(target.resolve()))
+            self._report_url_cache[target] = url
 
         # Open with system default app (Finder on macOS)
-        QDesktopServices.openUrl(QUrl.fromLocalFile(str(target.resolve())))
+        QDesktopServices.openUrl(url)
+
+    def closeEvent(self, event):
+        if self.worker:
+            self.worker.stop()
+        self._close_session_csv()
+        super().closeEvent(event)
 
 
 def main():
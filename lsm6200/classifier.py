@@ -1,52 +1,82 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 from .config import ClassificationConfig
 
 
+VERDICT_PASS, VERDICT_FAIL, VERDICT_UNKNOWN, VERDICT_NONE = range(4)
+VERDICTS = ("PASS", "FAIL", "UNKNOWN", "NONE")
+
+
 @dataclass
 class ClassificationResult:
     verdict: str  # PASS, FAIL, UNKNOWN, NONE
     reason: Optional[str] = None
 
 
-def classify_value(value: Optional[float], cfg: ClassificationConfig) -> ClassificationResult:
+# Threshold operators indexed by op code (config.THRESHOLD_OPERATORS order):
+# (value, low, high) -> ok. lt/le/eq compare against low, gt/ge against high.
+_OPS: Tuple[Callable[[float, float, float], bool], ...] = (
+    lambda v, lo, hi: v < lo,
+    lambda v, lo, hi: v <= lo,
+    lambda v, lo, hi: v > hi,
+    lambda v, lo, hi: v >= hi,
+    lambda v, lo, hi: v == lo,
+    lambda v, lo, hi: lo <= v <= hi,
+)
+
+# Reason templates, only formatted when the caller wants a reason
+_REASONS: Tuple[str, ...] = (
+    "{v} < {lo}",
+    "{v} <= {lo}",
+    "{v} > {hi}",
+    "{v} >= {hi}",
+    "{v} == {lo}",
+    "{lo} <= {v} <= {hi}",
+)
+
+
+def classify_verdict(value: Optional[float], cfg: ClassificationConfig) -> int:
+    """Verdict code only (index into VERDICTS); no result object or reason text."""
+    if cfg.mode == "none":
+        return VERDICT_NONE
+
+    if value is None:
+        return VERDICT_UNKNOWN
+
+    if cfg.mode == "threshold":
+        rule = cfg.threshold
+        # Operator is resolved to an op code when it is assigned
+        code = rule.op_code
+        if code < 0:
+            return VERDICT_UNKNOWN
+        return VERDICT_PASS if _OPS[code](value, rule.low, rule.high) else VERDICT_FAIL
+
+    return VERDICT_UNKNOWN
+
+
+def classification_reason(value: Optional[float], cfg: ClassificationConfig) -> Optional[str]:
+    """Reason text matching classify_verdict; PASS/FAIL text only when cfg.log_reason."""
     if cfg.mode == "none":
-        return ClassificationResult("NONE", "Classification disabled")
+        return "Classification disabled"
 
     if value is None:
-        return ClassificationResult("UNKNOWN", "No numeric value parsed")
+        return "No numeric value parsed"
 
     if cfg.mode == "threshold":
         rule = cfg.threshold
-        op = rule.operator.lower()
-        lo = rule.low
-        hi = rule.high
-
-        if op == "lt":
-            ok = value < lo
-            expr = f"{value} < {lo}"
-        elif op == "le":
-            ok = value <= lo
-            expr = f"{value} <= {lo}"
-        elif op == "gt":
-            ok = value > hi
-            expr = f"{value} > {hi}"
-        elif op == "ge":
-            ok = value >= hi
-            expr = f"{value} >= {hi}"
-        elif op == "eq":
-            ok = value == lo
-            expr = f"{value} == {lo}"
-        elif op == "between":
-            ok = lo <= value <= hi
-            expr = f"{lo} <= {value} <= {hi}"
-        else:
-            return ClassificationResult("UNKNOWN", f"Unknown operator: {rule.operator}")
-
-        return ClassificationResult("PASS" if ok else "FAIL", expr)
+        code = rule.op_code
+        if code < 0:
+            return f"Unknown operator: {rule.operator}"
+        if not cfg.log_reason:
+            return None
+        return _REASONS[code].format(v=value, lo=rule.low, hi=rule.high)
 
     # Placeholder for future modes (e.g., window, ML, etc.)
-    return ClassificationResult("UNKNOWN", f"Unknown mode: {cfg.mode}")
+    return f"Unknown mode: {cfg.mode}"
+
+
+def classify_value(value: Optional[float], cfg: ClassificationConfig) -> ClassificationResult:
+    return ClassificationResult(VERDICTS[classify_verdict(value, cfg)], classification_reason(value, cfg))
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import copy
 import dataclasses
+import functools
 import pathlib
 import os
 import sys
-from typing import Any, Dict, Optional
-
-import yaml
+from typing import IO, Any, Callable, Dict, Iterator, Optional, Tuple
 
 
 DEFAULT_CONFIG_PATH = pathlib.Path(__file__).resolve().parents[1] / "config.yaml"
 
+# Threshold operators; the index is the op code used by the classifier
+THRESHOLD_OPERATORS = ("lt", "le", "gt", "ge", "eq", "between")
+_OP_CODES = {op: code for code, op in enumerate(THRESHOLD_OPERATORS)}
+
 
 @dataclasses.dataclass
 class SerialConfig:
@@ -34,11 +38,23 @@ class ThresholdRule:
     low: float = 0.0
     high: float = 10.0
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "operator":
+            # Resolved on every assignment (init, config merge, GUI edits), not per sample
+            super().__setattr__("_op_code", _OP_CODES.get(str(value).lower(), -1))
+
+    @property
+    def op_code(self) -> int:
+        """Index into THRESHOLD_OPERATORS for `operator` (case-insensitive); -1 if unknown."""
+        return self._op_code
+
 
 @dataclasses.dataclass
 class ClassificationConfig:
     mode: str = "threshold"  # threshold | window | none
     units: str = "mm"
+    log_reason: bool = True  # build the "value <op> limit" reason text for PASS/FAIL
     threshold: ThresholdRule = dataclasses.field(default_factory=ThresholdRule)
 
 
@@ -47,6 +63,8 @@ class LoggingConfig:
     csv_path: str = "logs/readings.csv"
     append: bool = True
     timestamp_tz: str = "local"  # local | utc
+    flush_every: int = 1  # flush the CSV to the OS every N rows
+    batch_size: int = 1  # write formatted rows to the file in groups of N
 
 
 @dataclasses.dataclass
@@ -57,21 +75,66 @@ class AppConfig:
     logging: LoggingConfig = dataclasses.field(default_factory=LoggingConfig)
 
 
+# Per-section defaults for _from_dict, built once at import (all values are immutable)
+_SERIAL_DEFAULTS = dataclasses.asdict(SerialConfig())
+_PROTO_DEFAULTS = dataclasses.asdict(ProtocolConfig())
+_THR_DEFAULTS = dataclasses.asdict(ThresholdRule())
+_CLS_DEFAULTS = {k: v for k, v in dataclasses.asdict(ClassificationConfig()).items() if k != "threshold"}
+_LOG_DEFAULTS = dataclasses.asdict(LoggingConfig())
+
+
+@functools.lru_cache(maxsize=1)
+def _yaml_load() -> Callable[[IO[str]], Any]:
+    # Imported on first parse: PyYAML is slow to import and --help/--list-ports never need it
+    import yaml
+
+    try:
+        # libyaml-backed loader (bundled with PyYAML wheels); parses in C
+        loader = yaml.CSafeLoader
+    except AttributeError:  # PyYAML built without libyaml
+        loader = yaml.SafeLoader
+    return functools.partial(yaml.load, Loader=loader)
+
+
+# Parsed configs keyed by (path, mtime_ns) so edits to the file invalidate the entry
+_config_cache: Dict[Tuple[str, Optional[int]], AppConfig] = {}
+
+
 def load_config(path: Optional[pathlib.Path] = None) -> AppConfig:
     cfg_path = path or _resolve_config_path()
-    if cfg_path and cfg_path.exists():
-        with open(cfg_path, "r", encoding="utf-8") as f:
-            data: Dict[str, Any] = yaml.safe_load(f) or {}
-        cfg = _from_dict(data)
-    else:
-        cfg = AppConfig()
+    try:
+        mtime: Optional[int] = pathlib.Path(cfg_path).stat().st_mtime_ns if cfg_path else None
+    except OSError:
+        mtime = None
+    key = (str(cfg_path), mtime)
 
-    # On Windows, if logging path looks relative or defaults to logs/..., redirect to %ProgramData%
-    if os.name == "nt":
-        cfg.logging.csv_path = str(_resolve_windows_logs_path(cfg.logging.csv_path))
-    return cfg
+    cfg = _config_cache.get(key)
+    if cfg is None:
+        if mtime is not None:
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                data: Dict[str, Any] = _yaml_load()(f) or {}
+            # Empty file: nothing to merge
+            cfg = _from_dict(data) if data else AppConfig()
+        else:
+            cfg = AppConfig()
 
+        # On Windows, if logging path looks relative or defaults to logs/..., redirect to %ProgramData%
+        if os.name == "nt":
+            cfg.logging.csv_path = str(_resolve_windows_logs_path(cfg.logging.csv_path))
+        _config_cache[key] = cfg
+    # Callers mutate their config (CLI overrides, GUI session paths); hand out copies
+    return copy.deepcopy(cfg)
 
+
+def _clear_config_cache() -> None:
+    _config_cache.clear()
+    _resolve_config_path.cache_clear()
+
+
+load_config.cache_clear = _clear_config_cache  # type: ignore[attr-defined]
+
+
+@functools.lru_cache(maxsize=1)
 def _resolve_config_path() -> pathlib.Path:
     """Return the best config.yaml path based on platform and packaging.
 
@@ -81,14 +144,25 @@ def _resolve_config_path() -> pathlib.Path:
     3) Frozen exe dir (PyInstaller): <exe_dir>/config.yaml
     4) Project root (source checkout): repo/config.yaml
     """
-    candidates = []
+    first: Optional[pathlib.Path] = None
+    for p in _config_candidates():
+        if first is None:
+            first = p
+        # os.path.exists skips building a Path stat wrapper; stop at the first hit
+        if os.path.exists(p):
+            return p
+    # default to first candidate (even if not exists) so callers know where to write if needed
+    return first or DEFAULT_CONFIG_PATH
 
+
+def _config_candidates() -> Iterator[pathlib.Path]:
+    """Yield config.yaml candidates lazily, in priority order."""
     if os.name == "nt":
         programdata = os.environ.get("PROGRAMDATA", r"C:\\ProgramData")
-        candidates.append(pathlib.Path(programdata) / "Laser_Scan_Micrometer" / "config.yaml")
+        yield pathlib.Path(programdata) / "Laser_Scan_Micrometer" / "config.yaml"
         appdata = os.environ.get("APPDATA")
         if appdata:
-            candidates.append(pathlib.Path(appdata) / "Laser_Scan_Micrometer" / "config.yaml")
+            yield pathlib.Path(appdata) / "Laser_Scan_Micrometer" / "config.yaml"
 
     # PyInstaller frozen executable directory
     exe_dir: Optional[pathlib.Path] = None
@@ -101,16 +175,10 @@ def _resolve_config_path() -> pathlib.Path:
         except Exception:
             exe_dir = None
     if exe_dir:
-        candidates.append(exe_dir / "config.yaml")
+        yield exe_dir / "config.yaml"
 
     # Project root fallback
-    candidates.append(DEFAULT_CONFIG_PATH)
-
-    for p in candidates:
-        if p and p.exists():
-            return p
-    # default to first candidate (even if not exists) so callers know where to write if needed
-    return candidates[0]
+    yield DEFAULT_CONFIG_PATH
 
 
 def _resolve_windows_logs_path(current: str) -> pathlib.Path:
@@ -132,25 +200,22 @@ def _resolve_windows_logs_path(current: str) -> pathlib.Path:
     return base / p
 
 
-def _from_dict(d: Dict[str, Any]) -> AppConfig:
-    def get(section: str, defaults: Dict[str, Any]) -> Dict[str, Any]:
-        return {**defaults, **(d.get(section) or {})}
+def _merge(defaults: Dict[str, Any], overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return defaults | (overrides or {})
+
 
-    serial = SerialConfig(**get("serial", dataclasses.asdict(SerialConfig())))
-    protocol = ProtocolConfig(**get("protocol", dataclasses.asdict(ProtocolConfig())))
+def _from_dict(d: Dict[str, Any]) -> AppConfig:
+    serial = SerialConfig(**_merge(_SERIAL_DEFAULTS, d.get("serial")))
+    protocol = ProtocolConfig(**_merge(_PROTO_DEFAULTS, d.get("protocol")))
 
-    thr_defaults = dataclasses.asdict(ThresholdRule())
-    thr = ThresholdRule(**get("threshold", thr_defaults))
+    thr = ThresholdRule(**_merge(_THR_DEFAULTS, d.get("threshold")))
 
-    cls_defaults = dataclasses.asdict(ClassificationConfig())
-    # remove nested default threshold dict before constructing
-    cls_defaults.pop("threshold", None)
-    classification_kwargs = get("classification", cls_defaults)
+    classification_kwargs = _merge(_CLS_DEFAULTS, d.get("classification"))
     # Ensure we don't pass two values for 'threshold'
     classification_kwargs.pop("threshold", None)
     classification = ClassificationConfig(**classification_kwargs, threshold=thr)
 
-    logging_cfg = LoggingConfig(**get("logging", dataclasses.asdict(LoggingConfig())))
+    logging_cfg = LoggingConfig(**_merge(_LOG_DEFAULTS, d.get("logging")))
 
     return AppConfig(
         serial=serial,
@@ -1,18 +1,119 @@
 from __future__ import annotations
 
+import atexit
 import csv
-import datetime as dt
+import functools
+import io
+import os
 import pathlib
-from typing import Optional
+import re
+import time
+import weakref
+from typing import BinaryIO, Callable, Iterable, List, Optional, Tuple
 
 from .config import LoggingConfig
 
 
-def _now(tz: str) -> str:
+# Formatted rows are collected in memory and written in groups of
+# `LoggingConfig.batch_size`, and the file is flushed to the OS every
+# `LoggingConfig.flush_every` rows, or on the first row logged FLUSH_INTERVAL
+# seconds after the last flush (there is no timer; idle callers flush() or
+# close). Both default to 1, so a crash loses nothing; the large write buffer
+# only matters when they are raised.
+WRITE_BUFFER_SIZE = 1 << 16
+FLUSH_INTERVAL = 0.5
+
+_open_loggers: "weakref.WeakSet[CsvLogger]" = weakref.WeakSet()
+
+HEADER = (
+    "No.",
+    "timestamp",
+    "Cat1_超過上限公差",
+    "Cat2_0.115",
+    "Cat3_0.110",
+    "Cat4_0.105",
+    "Cat5_0.100",
+    "Cat6_超過下限公差",
+    "unit",
+    "reason",
+    "raw",
+)
+
+# Characters that make csv.writer quote a field (excel dialect, QUOTE_MINIMAL)
+_needs_quoting = re.compile(r'[,"\r\n]').search
+# The six category columns, pre-encoded: empty, or with the value in column k
+_EMPTY_CATS = b"," * 5
+_CATS_BEFORE = tuple(b"," * (k - 1) for k in range(1, 7))
+_CATS_AFTER = tuple(b"," * (6 - k) for k in range(1, 7))
+
+
+@functools.lru_cache(maxsize=1024)
+def _encoded(text: str) -> bytes:
+    # Units, verdicts and most reasons repeat from a small set; encode each once
+    return text.encode("utf-8")
+
+
+@functools.lru_cache(maxsize=1024)
+def _fmt3(value: float) -> bytes:
+    # Values are already quantized to 3 dp, so a run only sees a few dozen of them
+    return b"%.3f" % value
+
+
+def _category_cells(value_3dp: Optional[float], category_code: int) -> bytes:
+    # Prepare six category fields; put value into the matching one
+    if value_3dp is not None and 1 <= category_code <= 6:
+        # 0.0 and -0.0 share a cache key, so zero is formatted directly to keep its sign
+        cell = _fmt3(value_3dp) if value_3dp else b"%.3f" % value_3dp
+        return _CATS_BEFORE[category_code - 1] + cell + _CATS_AFTER[category_code - 1]
+    return _EMPTY_CATS
+
+
+def _csv_line(fields) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf).writerow(fields)
+    return buf.getvalue().encode("utf-8")
+
+
+_HEADER_LINE = _csv_line(HEADER)
+_TAIL_BYTES = 4096
+
+
+def _last_row_index(f: BinaryIO) -> Optional[int]:
+    """Read the "No." of the last row from the end of the file, without scanning it all."""
+    size = f.seek(0, os.SEEK_END)
+    f.seek(max(size - _TAIL_BYTES, 0))
+    tail = f.read()
+    for line in reversed(tail.splitlines()):
+        if line.strip():
+            try:
+                return int(line.split(b",", 1)[0])
+            except ValueError:
+                return None
+    return None
+
+
+def _make_timestamp(tz: str) -> Callable[[], Tuple[int, str, bytes]]:
+    """Return a timestamp function for one time zone, chosen once instead of per row.
+
+    Timestamps have one-second resolution, so each second is formatted only once;
+    the function returns (epoch second, text, ascii bytes).
+    """
     if tz == "utc":
-        return dt.datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    # default local
-    return dt.datetime.now().isoformat(timespec="seconds")
+        fmt, convert = "%Y-%m-%dT%H:%M:%SZ", time.gmtime
+    else:
+        # default local
+        fmt, convert = "%Y-%m-%dT%H:%M:%S", time.localtime
+    last = [(-1, "", b"")]
+
+    def timestamp() -> Tuple[int, str, bytes]:
+        sec = int(time.time())
+        cached = last[0]
+        if cached[0] != sec:
+            text = time.strftime(fmt, convert(sec))
+            cached = last[0] = (sec, text, text.encode("ascii"))
+        return cached
+
+    return timestamp
 
 
 class CsvLogger:
@@ -21,46 +122,92 @@ class CsvLogger:
         self.path = pathlib.Path(cfg.csv_path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self._file = None
-        self._writer = None
+        self._timestamp = _make_timestamp(cfg.timestamp_tz)
         self._index = 1
+        self._rows: List[bytes] = []
+        self._pending = 0
+        self._last_flush = time.monotonic()
 
     def __enter__(self):
-        mode = "a" if self.cfg.append else "w"
-        self._file = self.path.open(mode, newline="", encoding="utf-8")
-        self._writer = csv.writer(self._file)
+        # Append mode also reads, so the index lookup reuses this handle instead of reopening
+        mode = "a+b" if self.cfg.append else "wb"
+        self._file = self.path.open(mode, buffering=WRITE_BUFFER_SIZE)
         if not self.cfg.append or self._file.tell() == 0:
             # Header with index and six category columns
-            self._writer.writerow([
-                "No.",
-                "timestamp",
-                "Cat1_超過上限公差",
-                "Cat2_0.115",
-                "Cat3_0.110",
-                "Cat4_0.105",
-                "Cat5_0.100",
-                "Cat6_超過下限公差",
-                "unit",
-                "reason",
-                "raw",
-            ])
+            self._file.write(_HEADER_LINE)
             self._index = 1
         else:
-            # Continue index based on existing rows (exclude header)
+            # Continue numbering after the last row; count rows only if that fails
             try:
-                with self.path.open("r", encoding="utf-8") as rf:
-                    row_count = sum(1 for _ in rf)
-                # row_count includes header; data rows = max(row_count - 1, 0)
-                data_rows = max(row_count - 1, 0)
-                self._index = data_rows + 1
-            except Exception:
-                self._index = 1
+                last = _last_row_index(self._file)
+            except OSError:
+                last = None
+            if last is not None:
+                self._index = last + 1
+            else:
+                self._index = self._count_index()
+            self._file.seek(0, os.SEEK_END)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        _open_loggers.add(self)
         return self
 
+    def _count_index(self) -> int:
+        try:
+            self._file.seek(0)
+            row_count = sum(1 for _ in self._file)
+            # row_count includes header; data rows = max(row_count - 1, 0)
+            data_rows = max(row_count - 1, 0)
+            return data_rows + 1
+        except Exception:
+            return 1
+
     def __exit__(self, exc_type, exc, tb):
+        _open_loggers.discard(self)
         if self._file:
+            try:
+                # Make the finished log durable, not just handed to the OS
+                self._write_rows()
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError:
+                pass
             self._file.close()
             self._file = None
-            self._writer = None
+
+    def flush(self) -> None:
+        if self._file:
+            self._write_rows()
+            self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def _write_rows(self) -> None:
+        if self._rows:
+            self._file.write(b"".join(self._rows))
+            self._rows.clear()
+
+    def _rows_added(self, n: int) -> None:
+        self._pending += n
+        if len(self._rows) >= self.cfg.batch_size:
+            self._write_rows()
+        if self._pending >= self.cfg.flush_every or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def log(
+        self,
+        value: Optional[float],
+        unit: Optional[str],
+        verdict: str,
+        reason: str,
+        raw: str,
+    ) -> None:
+        if not self._file:
+            raise RuntimeError("CsvLogger must be used as a context manager")
+        # Uncategorized reading (live serial path): no category column is filled,
+        # the verdict goes into the reason column and the value is kept in raw
+        self._rows.append(self._format_row(_EMPTY_CATS, unit or "", f"{verdict}: {reason}" if reason else verdict, raw))
+        self._rows_added(1)
 
     def log_categorized(
         self,
@@ -70,18 +217,47 @@ class CsvLogger:
         reason: str,
         raw: str,
     ) -> None:
-        if not self._writer:
+        if not self._file:
+            raise RuntimeError("CsvLogger must be used as a context manager")
+        self._rows.append(self._format_row(_category_cells(value_3dp, category_code), unit, reason or "", raw))
+        self._rows_added(1)
+
+    def log_categorized_many(
+        self,
+        rows: Iterable[Tuple[Optional[float], int, str, str, str]],
+    ) -> None:
+        """Log many (value_3dp, category_code, unit, reason, raw) rows with one write."""
+        if not self._file:
             raise RuntimeError("CsvLogger must be used as a context manager")
-        # Prepare six category fields; put value into the matching one
-        cats = ["", "", "", "", "", ""]
-        if value_3dp is not None and 1 <= category_code <= 6:
-            cats[category_code - 1] = f"{value_3dp:.3f}"
-        self._writer.writerow([
-            self._index,
-            _now(self.cfg.timestamp_tz),
-            *cats,
-            unit,
-            reason or "",
-            raw,
-        ])
+        n = 0
+        for value_3dp, category_code, unit, reason, raw in rows:
+            self._rows.append(self._format_row(_category_cells(value_3dp, category_code), unit, reason or "", raw))
+            n += 1
+        self._write_rows()
+        self._rows_added(n)
+
+    def _format_row(self, cats: bytes, unit: str, reason: str, raw: str) -> bytes:
+        index = self._index
         self._index += 1
+        if _needs_quoting(unit + reason + raw):
+            # Rare: let the csv module handle quoting
+            cat_fields = cats.decode("ascii").split(",")
+            return _csv_line([index, self._timestamp()[1], *cat_fields, unit, reason, raw])
+        # Fixed schema with no special characters: assemble the line from bytes
+        return b"%d,%b,%b,%b,%b,%b\r\n" % (
+            index,
+            self._timestamp()[2],
+            cats,
+            _encoded(unit),
+            _encoded(reason),
+            raw.encode("utf-8"),
+        )
+
+
+@atexit.register
+def _flush_open_loggers() -> None:
+    for logger in list(_open_loggers):
+        try:
+            logger.flush()
+        except Exception:
+            pass
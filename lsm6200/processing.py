@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import functools
+import math
+from bisect import bisect_right
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP, getcontext
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
+
+import numpy as np
 
 getcontext().prec = 12
 
@@ -29,13 +34,49 @@ def round_half_up(value: float, decimals: int) -> float:
 
 def process_value(raw: float) -> ProcessedValue:
     # Ensure 5dp representation for display
-    raw_5dp = float(f"{raw:.5f}")
-    cut_4dp = truncate_to_decimals(raw_5dp, 4)
+    raw_5dp = round(raw, 5)
+    # Same rules as truncate_to_decimals/round_half_up, on exact scaled integers
+    # (raw_5dp is the nearest float to a 5dp decimal, so n5 is exact)
+    n5 = round(raw_5dp * 100000)
+    n4 = n5 // 10 if n5 >= 0 else -(-n5 // 10)  # truncate to 4dp
     # Round to 3dp using ten-thousandth (i.e., HALF_UP on the 4th digit)
-    rounded_3dp = round_half_up(cut_4dp, 3)
+    n3 = (n4 + 5) // 10 if n4 >= 0 else -((-n4 + 5) // 10)
+    # Small negatives truncate/round to -0.0 like the Decimal path, so they log as "-0.000"
+    cut_4dp = n4 / 10000 if n4 or n5 >= 0 else -0.0
+    rounded_3dp = n3 / 1000 if n3 or n5 >= 0 else -0.0
     return ProcessedValue(raw_5dp=raw_5dp, cut_4dp=cut_4dp, rounded_3dp=rounded_3dp)
 
 
+@dataclass
+class ProcessedBatch:
+    raw_5dp: np.ndarray
+    cut_4dp: np.ndarray
+    rounded_3dp: np.ndarray
+
+
+def process_values(raw: np.ndarray) -> ProcessedBatch:
+    """Vectorized process_value: same truncation/rounding rules on a whole array."""
+    # Work on scaled integers so truncation and HALF_UP are exact, like the Decimal path
+    raw = np.asarray(raw, dtype=np.float64)
+    scaled = raw * 1e5
+    n5 = np.rint(scaled)
+    # raw * 1e5 is itself rounded, so a value within a few ulps of a .5 tie can go the
+    # other way than round(raw, 5); settle those few with the scalar rule
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= 4 * np.abs(np.spacing(scaled))
+    if near_tie.any():
+        n5[near_tie] = [round(round(v, 5) * 100000) for v in raw[near_tie].tolist()]
+    n5 = n5.astype(np.int64)
+    sign = np.sign(n5)
+    n4 = sign * (np.abs(n5) // 10)
+    n3 = sign * ((np.abs(n4) + 5) // 10)
+    # copysign keeps the scalar path's signed zeros (-0.0 for small negatives)
+    return ProcessedBatch(
+        raw_5dp=np.copysign(n5 / 1e5, raw),
+        cut_4dp=np.copysign(n4 / 1e4, n5),
+        rounded_3dp=np.copysign(n3 / 1e3, n5),
+    )
+
+
 @dataclass
 class Category:
     code: int
@@ -43,15 +84,18 @@ class Category:
     color: str
 
 
+_CATEGORIES = (
+    Category(1, "超過上限公差", "#d32f2f"),
+    Category(2, "標準+0.005", "#ef6c00"),
+    Category(3, "標準±0.002", "#388e3c"),
+    Category(4, "標準-0.005", "#1976d2"),
+    Category(5, "標準-0.010", "#7b1fa2"),
+    Category(6, "超過下限公差", "#5d4037"),
+)
+
+
 def categories_relative() -> list[Category]:
-    return [
-        Category(1, "超過上限公差", "#d32f2f"),
-        Category(2, "標準+0.005", "#ef6c00"),
-        Category(3, "標準±0.002", "#388e3c"),
-        Category(4, "標準-0.005", "#1976d2"),
-        Category(5, "標準-0.010", "#7b1fa2"),
-        Category(6, "超過下限公差", "#5d4037"),
-    ]
+    return list(_CATEGORIES)
 
 
 @dataclass
@@ -60,36 +104,120 @@ class CategoryResult:
     reason: str
 
 
-def classify_six_bins(value_3dp: float, standard: float = 0.110) -> CategoryResult:
-    cats = categories_relative()
+@dataclass(frozen=True)
+class SixBinBands:
+    """Band limits for one standard size, plus sorted edges for bisect lookup."""
+    standard: float
+    hi_limit: float
+    bin2: Tuple[float, float]
+    bin3: Tuple[float, float]
+    bin4: Tuple[float, float]
+    bin5: Tuple[float, float]
+    lo_limit: float
+    edges: Tuple[float, ...]
+    codes: Tuple[int, ...]  # category code per interval between edges
+    reasons: Tuple[str, ...]  # reason template per interval, formatted with the value
+
+
+def _split_point(upper: float, lower: float) -> float:
+    """Smallest float that is at least as close to `upper` as to `lower` (ties go up)."""
+    # Equal centers (standards too large to tell them apart) or inf/nan have no
+    # split to search for, and the nextafter walk below would never stop
+    if upper == lower or not (math.isfinite(upper) and math.isfinite(lower)):
+        return upper
+    closer_up = lambda x: abs(x - upper) <= abs(x - lower)  # noqa: E731
+    m = (upper + lower) / 2
+    while not closer_up(m):
+        m = math.nextafter(m, math.inf)
+    while closer_up(math.nextafter(m, -math.inf)):
+        m = math.nextafter(m, -math.inf)
+    return m
+
+
+@functools.lru_cache(maxsize=8)
+def compute_bin_edges(standard: float) -> SixBinBands:
     # Compute bands relative to standard per user's spec
     hi_limit = standard + 0.008
-    bin2_lo, bin2_hi = standard + 0.003, standard + 0.007
-    bin3_lo, bin3_hi = standard - 0.002, standard + 0.002
-    bin4_lo, bin4_hi = standard - 0.007, standard - 0.003
-    bin5_lo, bin5_hi = standard - 0.012, standard - 0.008
+    bin2 = (standard + 0.003, standard + 0.007)
+    bin3 = (standard - 0.002, standard + 0.002)
+    bin4 = (standard - 0.007, standard - 0.003)
+    bin5 = (standard - 0.012, standard - 0.008)
     lo_limit = standard - 0.013
-
-    v = value_3dp
-    if v >= hi_limit:
-        return CategoryResult(cats[0], f"{v:.3f} >= {hi_limit:.3f}")
-    if bin2_lo <= v <= bin2_hi:
-        return CategoryResult(cats[1], f"{bin2_lo:.3f} <= {v:.3f} <= {bin2_hi:.3f}")
-    if bin3_lo <= v <= bin3_hi:
-        return CategoryResult(cats[2], f"{bin3_lo:.3f} <= {v:.3f} <= {bin3_hi:.3f}")
-    if bin4_lo <= v <= bin4_hi:
-        return CategoryResult(cats[3], f"{bin4_lo:.3f} <= {v:.3f} <= {bin4_hi:.3f}")
-    if bin5_lo <= v <= bin5_hi:
-        return CategoryResult(cats[4], f"{bin5_lo:.3f} <= {v:.3f} <= {bin5_hi:.3f}")
-    if v <= lo_limit:
-        return CategoryResult(cats[5], f"{v:.3f} <= {lo_limit:.3f}")
-
-    # If in gaps, choose nearest band center
-    centers = {
-        cats[1]: standard + 0.005,
-        cats[2]: standard,
-        cats[3]: standard - 0.005,
-        cats[4]: standard - 0.010,
-    }
-    closest = min(centers.items(), key=lambda kv: abs(v - kv[1]))
-    return CategoryResult(closest[0], f"closest to {closest[1]:.3f}")
+    c2, c3, c4, c5 = standard + 0.005, standard, standard - 0.005, standard - 0.010
+
+    # bisect_right puts v == edge into the upper interval, so inclusive upper
+    # bounds use the next float up to keep "v <= hi" semantics. Values in the
+    # gaps between bands go to the nearest band center, so each inner gap is
+    # split where the nearest center changes.
+    up = lambda x: math.nextafter(x, math.inf)  # noqa: E731
+    edges = (
+        up(lo_limit),
+        bin5[0], up(bin5[1]),
+        _split_point(c4, c5),
+        bin4[0], up(bin4[1]),
+        _split_point(c3, c4),
+        bin3[0], up(bin3[1]),
+        _split_point(c2, c3),
+        bin2[0], up(bin2[1]),
+        hi_limit,
+    )
+    codes = (6, 5, 5, 5, 4, 4, 4, 3, 3, 3, 2, 2, 2, 1)
+
+    def in_bin(lo: float, hi: float) -> str:
+        return f"{lo:.3f} <= {{:.3f}} <= {hi:.3f}"
+
+    def closest(center: float) -> str:
+        return f"closest to {center:.3f}"
+
+    reasons = (
+        f"{{:.3f}} <= {lo_limit:.3f}",
+        closest(c5), in_bin(*bin5), closest(c5),
+        closest(c4), in_bin(*bin4), closest(c4),
+        closest(c3), in_bin(*bin3), closest(c3),
+        closest(c2), in_bin(*bin2), closest(c2),
+        f"{{:.3f}} >= {hi_limit:.3f}",
+    )
+    return SixBinBands(standard, hi_limit, bin2, bin3, bin4, bin5, lo_limit, edges, codes, reasons)
+
+
+def classify_six_bins(
+    value_3dp: float,
+    standard: float = 0.110,
+    bands: Optional[SixBinBands] = None,
+) -> CategoryResult:
+    if bands is None:
+        bands = compute_bin_edges(standard)
+    idx = bisect_right(bands.edges, value_3dp)
+    return CategoryResult(_CATEGORIES[bands.codes[idx] - 1], bands.reasons[idx].format(value_3dp))
+
+
+@functools.lru_cache(maxsize=8)
+def make_classifier(standard: float) -> Callable[[float], CategoryResult]:
+    """classify_six_bins specialized for one standard; bands are resolved once, not per call."""
+    bands = compute_bin_edges(standard)
+    edges = bands.edges
+    categories = tuple(_CATEGORIES[code - 1] for code in bands.codes)
+    formats = tuple(r.format for r in bands.reasons)
+
+    def classify(value_3dp: float) -> CategoryResult:
+        idx = bisect_right(edges, value_3dp)
+        return CategoryResult(categories[idx], formats[idx](value_3dp))
+
+    return classify
+
+
+def process_batch(
+    raw: np.ndarray,
+    standard: float = 0.110,
+    bands: Optional[SixBinBands] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized process_value + classify_six_bins for bulk data (e.g. re-classifying logs).
+
+    Returns (values_3dp, category codes); use the scalar API for live readings.
+    """
+    if bands is None:
+        bands = compute_bin_edges(standard)
+    values_3dp = process_values(raw).rounded_3dp
+    # side="right" matches bisect_right in classify_six_bins
+    idx = np.searchsorted(np.asarray(bands.edges), values_3dp, side="right")
+    return values_3dp, np.asarray(bands.codes)[idx]
@@ -6,6 +6,10 @@ from typing import Optional
 
 
 NUMBER_RE = re.compile(r"[-+]?\d+(?:\.\d+)?")
+# First number in the line, plus trailing letters as the unit, in one scan
+LINE_RE = re.compile(r"(?P<num>[-+]?\d+(?:\.\d+)?)(?:.*?(?P<unit>[a-zA-Zμ]+)\s*$)?", re.DOTALL)
+# Characters of a bare reading such as "+00.11234"; such lines skip the regex
+_NUMBER_CHARS = "0123456789.+-"
 
 
 @dataclass
@@ -22,13 +26,17 @@ class Mitutoyo6200Parser:
     Adjust if your device emits prefixed frames or checksums.
     """
 
-    def __init__(self, expected_unit: Optional[str] = None):
-        self.expected_unit = expected_unit
+    def __init__(self, expected_unit: Optional[str] = None) -> None:
+        self.expected_unit: Optional[str] = expected_unit
 
     def parse_line(self, line: bytes | str) -> Optional[Measurement]:
         if isinstance(line, bytes):
             try:
-                text = line.decode("utf-8", errors="replace").strip()
+                # Device output is normally plain ASCII, which decodes without UTF-8 validation
+                if line.isascii():
+                    text = line.decode("ascii").strip()
+                else:
+                    text = line.decode("utf-8", errors="replace").strip()
             except Exception:
                 return None
         else:
@@ -36,16 +44,23 @@ class Mitutoyo6200Parser:
         if not text:
             return None
 
-        m = NUMBER_RE.search(text)
+        # Bare number: float() parses it directly. The first digit check keeps ".5"
+        # on the regex path, which reads it as 5 like any other leading garbage.
+        if not text.strip(_NUMBER_CHARS) and text[text[0] in "+-":][:1].isdigit():
+            try:
+                return Measurement(raw=text, value=float(text), unit=self.expected_unit)
+            except ValueError:
+                pass  # e.g. "1-2" or "1.2.3": let the regex take the first number
+
+        m = LINE_RE.search(text)
         if not m:
             return Measurement(raw=text, value=None, unit=None)
         try:
-            value = float(m.group(0))
+            value = float(m.group("num"))
         except ValueError:
             value = None
 
-        # Try to guess unit: take trailing letters
-        unit_match = re.search(r"([a-zA-Zμ]+)\s*$", text)
-        unit = unit_match.group(1) if unit_match else self.expected_unit
+        # Unit guess: trailing letters, else the configured unit
+        unit = m.group("unit") or self.expected_unit
 
         return Measurement(raw=text, value=value, unit=unit)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import contextlib
-from typing import List, Optional
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
 
 import serial  # type: ignore
 from serial import Serial
@@ -23,8 +24,27 @@ STOPBITS_MAP = {
 }
 
 
-def available_ports() -> List[str]:
-    return [p.device for p in list_ports.comports()]
+# (monotonic time of the scan, devices); comports() can take tens of ms, more on Windows
+_PORTS_CACHE: Tuple[float, Tuple[str, ...]] = (float("-inf"), ())
+
+
+def available_ports(ttl: float = 1.0) -> List[str]:
+    """List serial devices, reusing the previous scan if it is younger than ttl seconds."""
+    global _PORTS_CACHE
+    now = time.monotonic()
+    ts, devices = _PORTS_CACHE
+    if now - ts >= ttl:
+        devices = tuple(p.device for p in list_ports.comports())
+        _PORTS_CACHE = (now, devices)
+    return list(devices)
+
+
+def _invalidate_ports_cache() -> None:
+    global _PORTS_CACHE
+    _PORTS_CACHE = (float("-inf"), ())
+
+
+available_ports.invalidate = _invalidate_ports_cache  # type: ignore[attr-defined]
 
 
 def open_serial(
@@ -57,3 +77,29 @@ def managed_serial(*args, **kwargs):
         with contextlib.suppress(Exception):
             if ser and ser.is_open:
                 ser.close()
+
+
+def iter_lines(ser: Serial, is_running: Callable[[], bool]) -> Iterator[bytes]:
+    """Yield newline-terminated lines from ser, reading whatever is waiting at once.
+
+    Yields b"" whenever a read times out with nothing new, so callers can do idle
+    work. As with readline(), a partial line is handed over on timeout.
+    """
+    buf = bytearray()
+    while is_running():
+        chunk = ser.read(ser.in_waiting or 1)
+        if not chunk:
+            if buf:
+                yield bytes(buf)
+                buf.clear()
+            yield b""
+            continue
+        buf.extend(chunk)
+        start = 0
+        nl = buf.find(b"\n")
+        while nl >= 0:
+            yield bytes(buf[start:nl + 1])
+            start = nl + 1
+            nl = buf.find(b"\n", start)
+        if start:
+            del buf[:start]
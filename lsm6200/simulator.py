@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass
 from typing import Optional
 
+import numpy as np
+
+# Offsets drawn per refill of the next_value buffer
+SAMPLE_BUFFER_SIZE = 65536
+
 
 @dataclass
 class SimulatorConfig:
@@ -16,9 +20,23 @@ class MicrometerSimulator:
 
     def __init__(self, cfg: Optional[SimulatorConfig] = None):
         self.cfg = cfg or SimulatorConfig()
+        self._rng = np.random.default_rng()
+        # Unit offsets in [-1, 1), scaled by the current spread on use so cfg edits apply at once
+        self._buf: list[float] = []
+        self._idx = 0
 
     def next_value(self) -> float:
         # Generate a value around standard within +/- spread, with 5 decimal places
-        raw = self.cfg.standard + random.uniform(-self.cfg.spread, self.cfg.spread)
+        if self._idx >= len(self._buf):
+            self._buf = self._rng.uniform(-1.0, 1.0, SAMPLE_BUFFER_SIZE).tolist()
+            self._idx = 0
+        offset = self._buf[self._idx]
+        self._idx += 1
+        raw = self.cfg.standard + offset * self.cfg.spread
         # Quantize to 5 decimals like device might output
-        return float(f"{raw:.5f}")
+        return round(raw, 5)
+
+    def next_values(self, n: int) -> np.ndarray:
+        """Generate n demo values at once (same distribution as next_value)."""
+        raw = self.cfg.standard + self._rng.uniform(-self.cfg.spread, self.cfg.spread, n)
+        return np.round(raw, 5)
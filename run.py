@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from rich.console import Console
-from rich.table import Table
+# rich, PyYAML and the lsm6200 modules are imported where they are used, so
+# --help and --list-ports start without loading what they never touch
+if TYPE_CHECKING:
+    from rich.console import Console
 
-from lsm6200.config import AppConfig, load_config, SerialConfig, LoggingConfig
-from lsm6200.serial_utils import available_ports, managed_serial
-from lsm6200.protocols import Mitutoyo6200Parser
-from lsm6200.classifier import classify_value
-from lsm6200.logging_utils import CsvLogger
+    from lsm6200.config import AppConfig
 
-console = Console()
+# Driver-side serial buffers (Windows only)
+RX_BUFFER_SIZE = 8192
+TX_BUFFER_SIZE = 1024
+
+VERDICT_STYLES = {"PASS": "green", "FAIL": "red"}
+
+
+@functools.lru_cache(maxsize=None)
+def get_console() -> Console:
+    from rich.console import Console
+
+    return Console()
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -34,6 +44,9 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--no-append", action="store_true", help="Overwrite CSV instead of appending")
     p.add_argument("--utc", action="store_true", help="Use UTC timestamps in CSV")
 
+    # Output
+    p.add_argument("--quiet", action="store_true", help="Only log to CSV; do not print each reading")
+
     return p
 
 
@@ -66,6 +79,11 @@ def merge_overrides(cfg: AppConfig, args: argparse.Namespace) -> AppConfig:
 
 
 def print_ports_and_exit() -> None:
+    from rich.table import Table
+
+    from lsm6200.serial_utils import available_ports
+
+    console = get_console()
     ports = available_ports()
     if not ports:
         console.print("[yellow]No serial ports found. Plug in your USB-RS232 adapter and try again.[/yellow]")
@@ -84,6 +102,13 @@ def main(argv: Optional[list[str]] = None) -> int:
     if args.list_ports:
         print_ports_and_exit()
 
+    from lsm6200.classifier import classify_value
+    from lsm6200.config import load_config
+    from lsm6200.logging_utils import CsvLogger
+    from lsm6200.protocols import Mitutoyo6200Parser
+    from lsm6200.serial_utils import iter_lines, managed_serial
+
+    console = get_console()
     cfg_path = None if args.config is None else args.config
     cfg = load_config() if cfg_path is None else load_config(path=cfg_path)  # type: ignore[arg-type]
     cfg = merge_overrides(cfg, args)
@@ -107,20 +132,41 @@ def main(argv: Optional[list[str]] = None) -> int:
             stopbits=cfg.serial.stopbits,
             timeout=cfg.serial.timeout,
         ) as ser, CsvLogger(cfg.logging) as csvlog:
+            if hasattr(ser, "set_buffer_size"):
+                ser.set_buffer_size(rx_size=RX_BUFFER_SIZE, tx_size=TX_BUFFER_SIZE)
             console.print("[green]Reading... Press Ctrl+C to stop.[/green]")
-            while True:
-                line = ser.readline()
+            # Bind per-reading callables once; rich markup only for an interactive terminal
+            parse = parser.parse_line
+            classify = classify_value
+            log = csvlog.log
+            flush = csvlog.flush
+            cls_cfg = cfg.classification
+            interactive = sys.stdout.isatty()
+            show = console.print if not args.quiet and interactive else None
+            write = sys.stdout.write if not args.quiet and not interactive else None
+            stdout_flush = sys.stdout.flush
+            # Same chunked line reader as the GUI: one read() per burst instead of per byte
+            for line in iter_lines(ser, lambda: True):
                 if not line:
+                    flush()
                     continue
-                meas = parser.parse_line(line)
+                meas = parse(line)
                 if not meas:
                     continue
-                result = classify_value(meas.value, cfg.classification)
-
-                color = "green" if result.verdict == "PASS" else ("red" if result.verdict == "FAIL" else "yellow")
-                console.print(f"[{color}]value={meas.value} {meas.unit or ''}\tverdict={result.verdict}\treason={result.reason or ''}\traw=\"{meas.raw}\"[/{color}]")
-
-                csvlog.log(meas.value, meas.unit, result.verdict, result.reason or "", meas.raw)
+                result = classify(meas.value, cls_cfg)
+                reason = result.reason or ""
+
+                if show is not None or write is not None:
+                    text = f"value={meas.value} {meas.unit or ''}\tverdict={result.verdict}\treason={reason}\traw=\"{meas.raw}\""
+                    if show is not None:
+                        color = VERDICT_STYLES.get(result.verdict, "yellow")
+                        show(f"[{color}]{text}[/{color}]")
+                    else:
+                        # Flush per reading like Console.print did, so `| tee` shows lines as they arrive
+                        write(text + "\n")
+                        stdout_flush()
+
+                log(meas.value, meas.unit, result.verdict, reason, meas.raw)
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Stopped by user.[/yellow]")
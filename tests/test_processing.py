@@ -0,0 +1,64 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from lsm6200.processing import process_value, process_values, round_half_up, truncate_to_decimals
+
+
+def _reference(raw: float):
+    """Original Decimal pipeline: 5 dp text, truncate to 4 dp, HALF_UP to 3 dp."""
+    raw_5dp = float(f"{raw:.5f}")
+    cut_4dp = truncate_to_decimals(raw_5dp, 4)
+    return raw_5dp, cut_4dp, round_half_up(cut_4dp, 3)
+
+
+def _signed(value: float):
+    # == treats 0.0 and -0.0 as equal; the CSV does not ("0.000" vs "-0.000")
+    return value, math.copysign(1.0, value)
+
+
+def _samples():
+    # Every 5 dp step over +/-0.2, ties and their neighbours at the 5th decimal, random draws
+    steps = [k / 1e5 for k in range(-20000, 20001)]
+    ties = [(k + 0.5) / 1e5 for k in range(-20000, 20000, 7)]
+    near = [math.nextafter(t, d) for t in ties for d in (-math.inf, math.inf)]
+    rng = random.Random(0)
+    drawn = [rng.uniform(-0.2, 0.2) for _ in range(20000)]
+    zeros = [0.0, -0.0, -1e-6, 1e-6, -0.00004, -0.00049, -0.0005, 0.0005]
+    return steps + ties + near + drawn + zeros
+
+
+SAMPLES = _samples()
+
+
+def test_process_value_matches_decimal_reference():
+    for raw in SAMPLES:
+        pv = process_value(raw)
+        got = (pv.raw_5dp, pv.cut_4dp, pv.rounded_3dp)
+        assert tuple(map(_signed, got)) == tuple(map(_signed, _reference(raw))), raw
+
+
+def test_process_values_matches_process_value():
+    batch = process_values(np.array(SAMPLES))
+    for i, raw in enumerate(SAMPLES):
+        pv = process_value(raw)
+        for name in ("raw_5dp", "cut_4dp", "rounded_3dp"):
+            assert _signed(float(getattr(batch, name)[i])) == _signed(getattr(pv, name)), (raw, name)
+
+
+@pytest.mark.parametrize(
+    "raw, text",
+    [
+        (-0.00001, "-0.000"),
+        (-0.0001, "-0.000"),
+        (-0.00049, "-0.000"),
+        # raw_5dp is -0.0 here, which the Decimal path truncates as non-negative
+        (-1e-6, "0.000"),
+        (-0.0, "0.000"),
+    ],
+)
+def test_signed_zero_text(raw, text):
+    assert f"{process_value(raw).rounded_3dp:.3f}" == text
+    assert f"{process_values(np.array([raw])).rounded_3dp[0]:.3f}" == text